@@ -0,0 +1,32 @@
+"""Add composite roster and rarity/class indexes
+
+Revision ID: 4b7e2c91a0d3
+Revises: d20101d10889
+Create Date: 2025-06-16 10:12:44.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c91a0d3'
+down_revision: Union[str, None] = 'd20101d10889'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_esprits_owner_level', 'user_esprits', ['owner_id', 'current_level'], unique=False)
+    op.drop_index(op.f('ix_user_esprits_owner_id'), table_name='user_esprits')
+    op.create_index('ix_esprit_data_rarity_class', 'esprit_data', ['rarity', 'class_name'], unique=False)
+    op.drop_index(op.f('ix_esprit_data_rarity'), table_name='esprit_data')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_esprit_data_rarity'), 'esprit_data', ['rarity'], unique=False)
+    op.drop_index('ix_esprit_data_rarity_class', table_name='esprit_data')
+    op.create_index(op.f('ix_user_esprits_owner_id'), 'user_esprits', ['owner_id'], unique=False)
+    op.drop_index('ix_user_esprits_owner_level', table_name='user_esprits')
@@ -0,0 +1,51 @@
+"""Store rarity and class_name as SMALLINT enums
+
+Revision ID: a83f5d0e6c17
+Revises: 4b7e2c91a0d3
+Create Date: 2025-06-16 11:40:08.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83f5d0e6c17'
+down_revision: Union[str, None] = '4b7e2c91a0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match the Rarity / EspritClass enums in src/database/models.py
+RARITIES = ["Common", "Uncommon", "Rare", "Epic", "Celestial", "Supreme", "Deity"]
+CLASSES = ["Unknown", "Mystic", "Destroyer", "Support", "Guardian"]
+
+
+def _case(column: str, names: list, to_int: bool) -> str:
+    if to_int:
+        whens = " ".join(f"WHEN '{name}' THEN {i}" for i, name in enumerate(names))
+    else:
+        whens = " ".join(f"WHEN {i} THEN '{name}'" for i, name in enumerate(names))
+    return f"CASE {column} {whens} END"
+
+
+def upgrade() -> None:
+    op.execute(
+        f"UPDATE esprit_data SET rarity = {_case('rarity', RARITIES, True)}, "
+        f"class_name = COALESCE({_case('class_name', CLASSES, True)}, 0)"
+    )
+    with op.batch_alter_table('esprit_data') as batch_op:
+        batch_op.alter_column('rarity', existing_type=sqlmodel.sql.sqltypes.AutoString(), type_=sa.SmallInteger(), existing_nullable=False)
+        batch_op.alter_column('class_name', existing_type=sqlmodel.sql.sqltypes.AutoString(), type_=sa.SmallInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('esprit_data') as batch_op:
+        batch_op.alter_column('rarity', existing_type=sa.SmallInteger(), type_=sqlmodel.sql.sqltypes.AutoString(), existing_nullable=False)
+        batch_op.alter_column('class_name', existing_type=sa.SmallInteger(), type_=sqlmodel.sql.sqltypes.AutoString(), existing_nullable=False)
+    op.execute(
+        f"UPDATE esprit_data SET rarity = {_case('CAST(rarity AS INTEGER)', RARITIES, False)}, "
+        f"class_name = {_case('CAST(class_name AS INTEGER)', CLASSES, False)}"
+    )
@@ -0,0 +1,32 @@
+"""Add cached_power to user_esprits
+
+Revision ID: c5d19e7f2b48
+Revises: a83f5d0e6c17
+Create Date: 2025-06-16 14:22:51.093417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d19e7f2b48'
+down_revision: Union[str, None] = 'a83f5d0e6c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start at 0; the bot resyncs cached_power from the combat config on startup.
+    with op.batch_alter_table('user_esprits', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cached_power', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_user_esprits_owner_power', ['owner_id', 'cached_power'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user_esprits', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_esprits_owner_power')
+        batch_op.drop_column('cached_power')
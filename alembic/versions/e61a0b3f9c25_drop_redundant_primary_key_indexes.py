@@ -0,0 +1,30 @@
+"""Drop redundant indexes on primary key columns
+
+Revision ID: e61a0b3f9c25
+Revises: c5d19e7f2b48
+Create Date: 2025-06-16 15:07:33.641290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e61a0b3f9c25'
+down_revision: Union[str, None] = 'c5d19e7f2b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The primary key constraint already maintains a unique index on these columns.
+    op.drop_index(op.f('ix_esprit_data_esprit_id'), table_name='esprit_data')
+    op.drop_index(op.f('ix_users_user_id'), table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_user_id'), 'users', ['user_id'], unique=False)
+    op.create_index(op.f('ix_esprit_data_esprit_id'), 'esprit_data', ['esprit_id'], unique=False)
@@ -6,8 +6,8 @@ from dotenv import load_dotenv
 from datetime import datetime # Make sure datetime is imported
 
 from src.utils.logger import get_logger
-from src.utils.config_manager import load_all_configs # Import the new function
-from src.database.db import create_db_and_tables
+from src.utils.config_manager import ConfigManager
+from src.database.db import create_db_and_tables, get_session
 from src.database.data_loader import EspritDataLoader
 
 logger = get_logger(__name__)
@@ -25,8 +25,9 @@ class FayeBot(commands.Bot):
         intents.message_content = True
         super().__init__(command_prefix="!", intents=intents)
 
-        # --- NEW: Load all configs at startup ---
-        self.config = load_all_configs()
+        # --- Load all configs at startup; /admin reload config goes through config_manager ---
+        self.config_manager = ConfigManager()
+        self.config = self.config_manager.configs
         self.start_time = datetime.utcnow() # Store bot start time
 
         self.initial_cogs = [
@@ -37,6 +38,7 @@ class FayeBot(commands.Bot):
             "src.cogs.onboarding_cog",
             "src.cogs.summon_cog",
             "src.cogs.utility_cog",
+            "src.utils.background_tasks",
         ]
 
     async def setup_hook(self):
@@ -76,6 +78,9 @@ class FayeBot(commands.Bot):
                 
             # Final verification - ensure we have Epic Esprits for onboarding
             await self.verify_starter_esprits()
+
+            # Stored Sigil Power depends on the power config, which may have changed since last run
+            await self.resync_cached_power()
             
         except Exception as e:
             logger.critical(f"CRITICAL: Database setup failed: {e}", exc_info=True)
@@ -103,6 +108,19 @@ class FayeBot(commands.Bot):
             epic_names = [esprit.name for esprit in epic_esprits]
             logger.info(f"Available Epic Esprits: {', '.join(epic_names)}")
 
+    async def resync_cached_power(self):
+        """Bring UserEsprit.cached_power in line with the currently loaded combat config."""
+        from src.database.models import resync_cached_power
+
+        combat_settings = self.config.get("combat_settings", {})
+        async with get_session() as session:
+            updated = await resync_cached_power(
+                session, combat_settings.get("power_calculation", {}), combat_settings.get("stat_calculation", {})
+            )
+            await session.commit()
+        if updated:
+            logger.info(f"Resynced cached Sigil Power for {updated} Esprits")
+
     async def on_ready(self):
         """Called when the bot is ready and connected to Discord."""
         logger.info(f"Logged in as {self.user.name} (ID: {self.user.id})")
@@ -1,6 +1,7 @@
 # src/cogs/admin_cog.py
 from __future__ import annotations
 
+import asyncio
 import functools
 import traceback
 from typing import List, Literal, Optional
@@ -14,6 +15,7 @@ from sqlalchemy import func, select
 from src.database.data_loader import EspritDataLoader
 from src.database.db import get_session
 from src.database.models import User, UserEsprit
+from src.utils.database_optimizer import DatabaseOptimizer
 from src.utils.logger import get_logger
 from src.utils import transaction_logger
 
@@ -131,6 +133,14 @@ class AdminCog(commands.Cog):
             await s.commit()
         await interaction.followup.send(f"✅ Daily timers reset for {user.mention}.", ephemeral=True)
 
+    @admin_group.command(name="analyze", description="Refresh database planner statistics (run after a migration).")
+    @owner_only()
+    async def analyze(self, interaction: discord.Interaction):
+        async with get_session() as s:
+            await DatabaseOptimizer.analyze_tables(s)
+        logger.info(f"ANALYZE triggered by {interaction.user}")
+        await interaction.followup.send("✅ Database statistics refreshed.", ephemeral=True)
+
     @reload_group.command(name="config", description="Reload all config files and apply changes by reloading cogs.")
     @owner_only()
     async def reload_config(self, interaction: discord.Interaction):
@@ -140,9 +150,10 @@ class AdminCog(commands.Cog):
                 ephemeral=True
             )
         try:
-            self.bot.config_manager.load_all()
-            self.bot.config = self.bot.config_manager.configs
+            # File reads and parsing happen off the event loop so other interactions aren't stalled
+            self.bot.config = await asyncio.to_thread(self.bot.config_manager.load_all)
             logger.info(f"CONFIG RELOAD triggered by {interaction.user}")
+            await self.bot.resync_cached_power()
             reloaded_cogs, failed_cogs = [], []
             initial_cogs = getattr(self.bot, 'initial_cogs', [])
             for cog in initial_cogs:
@@ -7,7 +7,7 @@ from discord import app_commands
 from datetime import datetime, timedelta
 
 from src.database.db import get_session
-from src.database.models import User
+from src.database.models import User, increment_user_fields, spend_user_fields
 from src.utils.logger import get_logger
 from src.utils.rate_limiter import RateLimiter
 from src.utils import transaction_logger
@@ -96,7 +96,7 @@ class EconomyCog(commands.Cog):
             if not user:
                 return await interaction.followup.send("❌ You haven't started yet. Use `/start`.")
 
-            cooldown_hours = self.cooldowns.get('daily_claim_hours', 22)
+            cooldown_hours = self.DAILY_COOLDOWN_HOURS
             now = datetime.utcnow()
             if user.last_daily_claim and now < user.last_daily_claim + timedelta(hours=cooldown_hours):
                 remaining = (user.last_daily_claim + timedelta(hours=cooldown_hours)) - now
@@ -111,10 +111,11 @@ class EconomyCog(commands.Cog):
                 )
 
             # Grant rewards
-            for currency, amount in self.DAILY_REWARDS.items():
-                if hasattr(user, currency):
-                    setattr(user, currency, getattr(user, currency) + amount)
             user.last_daily_claim = now
+            await increment_user_fields(
+                session, user.user_id,
+                **{currency: amount for currency, amount in self.DAILY_REWARDS.items() if currency in User.__table__.c}
+            )
             await session.commit()
 
             transaction_logger.log_daily_claim(interaction, self.DAILY_REWARDS)
@@ -164,11 +165,10 @@ class EconomyCog(commands.Cog):
                     return await interaction.followup.send("❌ Invalid amount. Use a number or 'all'.")
 
             cost = qty * needed
-            if user.fayrite_shards < cost:
+            if user.fayrite_shards < cost or not await spend_user_fields(session, user.user_id, fayrite_shards=cost):
                 return await interaction.followup.send(f"❌ Not enough shards. You need **{cost:,}**.")
 
-            user.fayrite_shards -= cost
-            user.fayrites += qty
+            await increment_user_fields(session, user.user_id, fayrites=qty)
             await session.commit()
 
             transaction_logger.log_craft_item(
@@ -17,7 +17,7 @@ from src.views.esprit.dissolve_view import BulkDissolveView
 from src.views.esprit.select_view import EspritSelectView
 
 from src.database.db import get_session
-from src.database.models import User, UserEsprit, EspritData
+from src.database.models import User, UserEsprit, EspritData, top_esprits_for_user, increment_user_fields, spend_user_fields, get_owned_esprit, get_team_esprits
 from src.utils.logger import get_logger
 from src.utils.rate_limiter import RateLimiter
 from src.utils import transaction_logger
@@ -48,7 +48,7 @@ class EspritCog(commands.Cog):
     # --- Helper Methods ---
     async def _handle_error(self, inter: discord.Interaction, error: Exception):
         err_id = id(error)
-        command_name = inter.command.qualified_name if inter.command else "esprit command"
+        command_name = getattr(inter.command, "qualified_name", "esprit command")
         logger.error(f"[{err_id}] Error in '{command_name}': {error}", exc_info=True)
         content = f"❌ An unexpected error occurred (ID: `{err_id}`)."
         try:
@@ -100,8 +100,8 @@ class EspritCog(commands.Cog):
                 user = await s.get(User, str(inter.user.id), with_for_update=True)
                 if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
                 
-                ue = await s.get(UserEsprit, esprit_id, with_for_update=True, options=[selectinload(UserEsprit.esprit_data), selectinload(UserEsprit.owner)])
-                if not ue or ue.owner_id != str(inter.user.id): return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
+                ue = await get_owned_esprit(s, user, esprit_id, for_update=True)
+                if not ue: return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
                 
                 cap = ue.get_level_cap(prog_cfg.get("progression", {}))
                 if ue.current_level >= cap: return await inter.followup.send(f"❌ **{ue.esprit_data.name}** is at level cap ({cap}).", ephemeral=True)
@@ -119,15 +119,17 @@ class EspritCog(commands.Cog):
                 cost_cfg = combat_cfg.get("esprit_upgrade_system", {}).get("cost_formula", {"base": 15, "level_multiplier": 8})
                 total_cost = sum(cost_cfg['base'] + (lvl * cost_cfg['level_multiplier']) for lvl in range(ue.current_level, ue.current_level + levels_to_add))
                 
-                if user.virelite < total_cost: return await inter.followup.send(f"❌ Need **{total_cost:,}** Virelite, you have {user.virelite:,}.", ephemeral=True)
+                if user.virelite < total_cost or not await spend_user_fields(s, user.user_id, virelite=total_cost):
+                    return await inter.followup.send(f"❌ Need **{total_cost:,}** Virelite, you have {user.virelite:,}.", ephemeral=True)
                 
-                old_level, old_pow = ue.current_level, ue.calculate_power(combat_cfg.get("power_calculation", {}), combat_cfg.get("stat_calculation", {}))
-                user.virelite -= total_cost
+                # cached_power is current for this config, so only the post-upgrade power is computed
+                old_level, old_pow = ue.current_level, ue.cached_power
+                stat_cfg = combat_cfg.get("stat_calculation", {})
                 ue.current_level += levels_to_add
-                ue.current_hp = ue.calculate_stat("hp", combat_cfg.get("stat_calculation", {}))
+                ue.current_hp = ue.calculate_stat("hp", stat_cfg)
+                new_pow = ue.refresh_cached_power(combat_cfg.get("power_calculation", {}), stat_cfg)
                 await s.commit()
 
-            new_pow = ue.calculate_power(combat_cfg.get("power_calculation", {}), combat_cfg.get("stat_calculation", {}))
             embed = discord.Embed(title="⭐ Upgrade Complete!", description=f"**{ue.esprit_data.name}** has grown stronger!", color=discord.Color.gold())
             embed.add_field(name="Level", value=f"{old_level} → **{ue.current_level}**", inline=True).add_field(name="Sigil Power", value=f"{old_pow:,} → **{new_pow:,}**", inline=True)
             embed.add_field(name="Virelite Spent", value=f"{total_cost:,}", inline=False)
@@ -146,18 +148,18 @@ class EspritCog(commands.Cog):
             async with get_session() as s:
                 user = await s.get(User, str(inter.user.id), with_for_update=True)
                 if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
-                ue = await s.get(UserEsprit, esprit_id, with_for_update=True, options=[selectinload(UserEsprit.esprit_data), selectinload(UserEsprit.owner)])
-                if not ue or ue.owner_id != str(inter.user.id): return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
+                ue = await get_owned_esprit(s, user, esprit_id, for_update=True)
+                if not ue: return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
                 can_break_info = ue.can_limit_break(prog_cfg.get("progression", {}))
                 if not can_break_info["can_break"]: return await inter.followup.send(f"❌ Cannot limit break: {can_break_info['reason']}.", ephemeral=True)
                 cost = ue.get_limit_break_cost(lb_cfg)
-                if user.remna < cost["remna"] or user.virelite < cost["virelite"]: return await inter.followup.send(f"❌ Need **{cost['remna']:,} Remna** & **{cost['virelite']:,} Virelite**.", ephemeral=True)
-                old_power = ue.calculate_power(combat_cfg.get("power_calculation", {}), combat_cfg.get("stat_calculation", {}))
-                user.remna -= cost["remna"]; user.virelite -= cost["virelite"]
+                if user.remna < cost["remna"] or user.virelite < cost["virelite"] or not await spend_user_fields(s, user.user_id, remna=cost["remna"], virelite=cost["virelite"]):
+                    return await inter.followup.send(f"❌ Need **{cost['remna']:,} Remna** & **{cost['virelite']:,} Virelite**.", ephemeral=True)
+                old_power = ue.cached_power
                 ue.limit_breaks_performed += 1
                 ue.stat_boost_multiplier *= lb_cfg.get("compound_rate", 1.1)
+                new_power = ue.refresh_cached_power(combat_cfg.get("power_calculation", {}), combat_cfg.get("stat_calculation", {}))
                 await s.commit()
-            new_power = ue.calculate_power(combat_cfg.get("power_calculation", {}), combat_cfg.get("stat_calculation", {}))
             embed = discord.Embed(title="🔓 LIMIT BREAK!", description=f"**{ue.esprit_data.name}** shattered its limits!", color=discord.Color.purple())
             embed.add_field(name="New Limit Breaks", value=f"{ue.limit_breaks_performed}", inline=True).add_field(name="Sigil Power", value=f"{old_power:,} → **{new_power:,}**", inline=True)
             embed.add_field(name="Cost", value=f"{cost['remna']:,} Remna, {cost['virelite']:,} Virelite", inline=False)
@@ -184,9 +186,9 @@ class EspritCog(commands.Cog):
             user = await s.get(User, str(inter.user.id), with_for_update=True)
             if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
 
-            ue = await s.get(UserEsprit, esprit_id, with_for_update=True, options=[selectinload(UserEsprit.esprit_data)])
-            if not ue or ue.owner_id != str(inter.user.id): return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
-            if ue.id in {user.active_esprit_id, user.support1_esprit_id, user.support2_esprit_id} or ue.locked:
+            ue = await get_owned_esprit(s, user, esprit_id, for_update=True)
+            if not ue: return await inter.followup.send("❌ Esprit not found or not yours.", ephemeral=True)
+            if ue.id in user.team_esprit_ids or ue.locked:
                 return await inter.followup.send("❌ Cannot dissolve a locked or equipped Esprit.", ephemeral=True)
 
             confirm = ConfirmationView(inter.user.id)
@@ -196,7 +198,7 @@ class EspritCog(commands.Cog):
 
             reward = rewards_cfg.get(ue.esprit_data.rarity, {})
             v_gain, r_gain = reward.get("virelite", 0), reward.get("remna", 0)
-            user.virelite += v_gain; user.remna += r_gain
+            await increment_user_fields(s, user.user_id, virelite=v_gain, remna=r_gain)
             dissolved_copy = ue
             await s.delete(ue); await s.commit()
 
@@ -211,7 +213,7 @@ class EspritCog(commands.Cog):
         async with get_session() as s:
             user = await s.get(User, str(inter.user.id))
             if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
-            team_ids = {user.active_esprit_id, user.support1_esprit_id, user.support2_esprit_id}
+            team_ids = {eid for eid in user.team_esprit_ids if eid}
             q = select(UserEsprit).where(UserEsprit.owner_id == str(inter.user.id), UserEsprit.locked == False, ~UserEsprit.id.in_(team_ids)).options(selectinload(UserEsprit.esprit_data))
             if rarity_filter: q = q.join(EspritData).where(EspritData.rarity == rarity_filter)
             esprits = (await s.execute(q.order_by(UserEsprit.current_level))).scalars().all()
@@ -230,7 +232,7 @@ class EspritCog(commands.Cog):
             for e in to_delete:
                 reward = rewards_cfg.get(e.esprit_data.rarity, {}); total_rewards["virelite"] += reward.get("virelite", 0); total_rewards["remna"] += reward.get("remna", 0)
                 dissolved_for_log.append(e); await s.delete(e)
-            user.virelite += total_rewards["virelite"]; user.remna += total_rewards["remna"]
+            await increment_user_fields(s, user.user_id, **total_rewards)
             await s.commit()
 
         embed = discord.Embed(title="♻️ Bulk Dissolve Complete", description=f"Dissolved **{len(dissolved_for_log)}** Esprits.", color=discord.Color.green())
@@ -247,15 +249,10 @@ class EspritCog(commands.Cog):
             async with get_session() as s:
                 user = await s.get(User, str(inter.user.id))
                 if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
-                team_ids = {slot.value: getattr(user, slot.value) for slot in TeamSlot}
-                esprit_map = {}
-                if valid_ids := [eid for eid in team_ids.values() if eid]:
-                    res = await s.execute(select(UserEsprit).where(UserEsprit.id.in_(valid_ids)).options(selectinload(UserEsprit.esprit_data)))
-                    esprit_map = {e.id: e for e in res.scalars()}
+                team = await get_team_esprits(s, user)
             embed = discord.Embed(title=f"⚔️ {inter.user.display_name}'s Team", color=discord.Color.blue())
             total_power, power_cfg, stat_cfg = 0, self.bot.config.get("combat_settings", {}).get("power_calculation", {}), self.bot.config.get("combat_settings", {}).get("stat_calculation", {})
-            for slot in TeamSlot:
-                esprit = esprit_map.get(team_ids[slot.value])
+            for slot, esprit in zip(TeamSlot, team):
                 name, value = f"{slot.get_icon()} {slot.name.title()}", "_Empty_"
                 if esprit:
                     power = esprit.calculate_power(power_cfg, stat_cfg); total_power += power
@@ -288,8 +285,8 @@ class EspritCog(commands.Cog):
                     await s.commit()
                     return await inter.edit_original_response(content=f"✅ Slot **{slot.name.title()}** cleared.", view=None)
                 
-                ue = await s.get(UserEsprit, esprit_id, options=[selectinload(UserEsprit.esprit_data)])
-                if not ue or ue.owner_id != str(inter.user.id): return await inter.edit_original_response(content="❌ Esprit not found or not yours.", view=None)
+                ue = await get_owned_esprit(s, user, esprit_id)
+                if not ue: return await inter.edit_original_response(content="❌ Esprit not found or not yours.", view=None)
                 
                 team_ids = {s.value: getattr(user, s.value) for s in TeamSlot}
                 if esprit_id in team_ids.values() and team_ids.get(slot.value) != esprit_id:
@@ -307,20 +304,16 @@ class EspritCog(commands.Cog):
             async with get_session() as s:
                 user = await s.get(User, str(inter.user.id), with_for_update=True)
                 if not user: return await inter.followup.send("❌ You need to `/start` first.", ephemeral=True)
-                esprits = await self._get_user_esprits(s, str(inter.user.id))
+                esprits = await top_esprits_for_user(s, str(inter.user.id), k=3)
                 if not esprits: return await inter.followup.send("❌ You have no Esprits to form a team.", ephemeral=True)
-                power_cfg, stat_cfg = self.bot.config.get("combat_settings", {}).get("power_calculation", {}), self.bot.config.get("combat_settings", {}).get("stat_calculation", {})
-                esprits.sort(key=lambda e: e.calculate_power(power_cfg, stat_cfg), reverse=True)
                 
-                user.active_esprit_id = esprits[0].id if len(esprits) > 0 else None
-                user.support1_esprit_id = esprits[1].id if len(esprits) > 1 else None
-                user.support2_esprit_id = esprits[2].id if len(esprits) > 2 else None
+                user.set_team([e.id for e in esprits])
                 await s.commit()
 
                 lines, total_power = [], 0
                 for i, ue in enumerate(esprits[:3]):
                     slot = [TeamSlot.LEADER, TeamSlot.SUPPORT1, TeamSlot.SUPPORT2][i]
-                    power = ue.calculate_power(power_cfg, stat_cfg); total_power += power
+                    power = ue.cached_power; total_power += power
                     lines.append(f"**{slot.get_icon()} {slot.name.title()}:** {ue.esprit_data.name} (Sigil: {power:,})")
                 
                 embed = discord.Embed(title="✅ Team Optimized!", description="Your strongest Esprits are now equipped.", color=discord.Color.green())
@@ -8,7 +8,7 @@ from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 
 from src.database.db import get_session
-from src.database.models import User, UserEsprit, EspritData
+from src.database.models import User, EspritData, bulk_create_esprits
 from src.utils.logger import get_logger
 from src.utils import transaction_logger
 from src.utils.image_generator import ImageGenerator
@@ -112,15 +112,13 @@ class OnboardingCog(commands.Cog):
                 session.add(new_user)
                 await session.flush() # Flush to assign default values from the DB
 
-                # Create the UserEsprit object
-                new_user_esprit = UserEsprit(
-                    owner_id=new_user.user_id, 
-                    esprit_data_id=chosen_esprit_data.esprit_id, 
-                    current_hp=chosen_esprit_data.base_hp, 
-                    current_level=self.STARTER_LEVEL,
+                # Create the UserEsprit object (its id and cached power are set on insert)
+                combat_settings = self.bot.config.get("combat_settings", {})
+                new_user_esprit, = await bulk_create_esprits(
+                    session, new_user.user_id, [chosen_esprit_data],
+                    combat_settings.get("power_calculation", {}), combat_settings.get("stat_calculation", {}),
+                    level=self.STARTER_LEVEL,
                 )
-                session.add(new_user_esprit)
-                await session.flush() # Flush to get the new_user_esprit.id
 
                 # Link the active esprit back to the user
                 new_user.active_esprit_id = new_user_esprit.id
@@ -139,10 +137,8 @@ class OnboardingCog(commands.Cog):
                 currency_lines = [f"• **{v:,}** {k.replace('_', ' ').title()}" for k, v in self.STARTER_CURRENCIES.items() if v > 0]
                 flavor_line = random.choice(self.flavor_texts)
 
-                card_pil = await self.image_generator.render_esprit_card(chosen_esprit_data.model_dump())
-                with io.BytesIO() as buf:
-                    card_pil.save(buf, "PNG")
-                    file = discord.File(io.BytesIO(buf.getvalue()), filename="esprit_card.png")
+                card_png = await self.image_generator.render_esprit_card_png(chosen_esprit_data.model_dump())
+                file = discord.File(io.BytesIO(card_png), filename="esprit_card.png")
 
                 embed = discord.Embed(
                     title="🎉 Welcome to Faye RPG! 🎉",
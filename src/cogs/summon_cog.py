@@ -12,7 +12,7 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import User, EspritData, UserEsprit
+from src.database.models import User, EspritData, UserEsprit, bulk_create_esprits, spend_user_fields
 from src.database.db import get_session
 from src.utils.image_generator import ImageGenerator
 from src.utils.rng_manager import RNGManager
@@ -122,14 +122,13 @@ class EspritSummonPaginationView(discord.ui.View):
         await interaction.followup.send(embed=embed)
 
     @classmethod
-    async def create(cls, bot: commands.Bot, summons: List[Tuple[UserEsprit, EspritData]], author_id: int, combat_settings: dict, visuals_config: dict):
+    async def create(cls, bot: commands.Bot, summons: List[Tuple[UserEsprit, EspritData]], author_id: int, combat_settings: dict, visuals_config: dict, image_generator: ImageGenerator):
         """
         REFACTORED: Now accepts config dictionaries as arguments instead of fetching them.
         This decouples the View from the main bot's config structure.
         """
         pages = []
         rarities_data = visuals_config.get("rarities", {})
-        image_generator = ImageGenerator("assets")
 
         for idx, (user_esprit, esprit_data) in enumerate(summons):
             power = user_esprit.calculate_power(combat_settings.get("power_calculation", {}), combat_settings.get("stat_calculation", {}))
@@ -142,10 +141,7 @@ class EspritSummonPaginationView(discord.ui.View):
                 color=color
             ).set_footer(text=f"{idx+1} of {len(summons)} • UID: {user_esprit.id[:6]}")
             
-            card_img = await image_generator.render_esprit_card(esprit_data.model_dump())
-            with io.BytesIO() as buf:
-                card_img.save(buf, format="PNG")
-                image_bytes = buf.getvalue()
+            image_bytes = await image_generator.render_esprit_card_png(esprit_data.model_dump())
             
             embed.set_image(url=f"attachment://card_{idx}.png")
             pages.append((embed, image_bytes, (user_esprit, esprit_data)))
@@ -158,6 +154,7 @@ class SummonCog(commands.Cog):
         self.rng = RNGManager()
         self.rate_limiter = RateLimiter(calls=2, period=15)
         self.cache = CacheManager(default_ttl=3600)
+        self.image_generator = ImageGenerator("assets")
 
     async def _choose_random_esprit(self, rarity: str, session: AsyncSession) -> Optional[EspritData]:
         # Logic remains sound.
@@ -176,8 +173,8 @@ class SummonCog(commands.Cog):
         await self.cache.set(cache_key, [{'esprit_id': i} for i in pool_ids])
         return await session.get(EspritData, random.choice(pool_ids))
 
-    async def _internal_perform_summon(self, user: User, banner_type: str, banner_cfg: dict, session: AsyncSession) -> Optional[Tuple[UserEsprit, EspritData]]:
-        # Logic remains sound.
+    async def _internal_perform_summon(self, user: User, banner_type: str, banner_cfg: dict, session: AsyncSession) -> Optional[EspritData]:
+        # Only rolls the Esprit; rows are created in one batch by the caller.
         rarity_weights = banner_cfg.get("rarity_distribution", {})
         chosen_rarity = self.rng.get_random_rarity(rarity_weights) # Pity logic would go here
         
@@ -185,12 +182,7 @@ class SummonCog(commands.Cog):
         if not esprit_data:
             logger.error(f"Failed to find Esprit of rarity '{chosen_rarity}' for summon.")
             return None
-
-        new_user_esprit = UserEsprit(owner_id=str(user.user_id), esprit_data_id=esprit_data.esprit_id, current_hp=esprit_data.base_hp, current_level=1)
-        session.add(new_user_esprit)
-        await session.flush()
-        new_user_esprit.esprit_data = esprit_data
-        return new_user_esprit, esprit_data
+        return esprit_data
 
     @app_commands.command(name="summon", description="Summon Esprits from the specified banner.")
     @app_commands.describe(banner="The banner to summon from.", amount="Use '10' for a multi-summon.")
@@ -222,21 +214,25 @@ class SummonCog(commands.Cog):
                 else:
                     currency, cost_single, cost_multi = banner_cfg.get("currency"), banner_cfg.get("cost_single", 9999), banner_cfg.get("cost_multi", 99990)
                     total_cost = cost_multi if summon_count == 10 else cost_single
-                    if getattr(user, currency, 0) < total_cost:
+                    if getattr(user, currency, 0) < total_cost or not await spend_user_fields(session, user.user_id, **{currency: total_cost}):
                         return await interaction.followup.send(f"❌ Not enough {currency.replace('_', ' ').title()}. You need {total_cost}.", ephemeral=True)
-                    setattr(user, currency, getattr(user, currency) - total_cost)
                     cost_str = f"{total_cost} {currency.replace('_', ' ').title()}"
 
-                summon_results = [result for _ in range(summon_count) if (result := await self._internal_perform_summon(user, banner, banner_cfg, session))]
-                if not summon_results:
+                rolled = [result for _ in range(summon_count) if (result := await self._internal_perform_summon(user, banner, banner_cfg, session))]
+                if not rolled:
                     return await interaction.followup.send("Summoning failed. This may be a configuration error.", ephemeral=True)
+                combat_settings = self.bot.config.get("combat_settings", {})
+                created = await bulk_create_esprits(
+                    session, str(user.user_id), rolled,
+                    combat_settings.get("power_calculation", {}), combat_settings.get("stat_calculation", {})
+                )
+                summon_results = list(zip(created, rolled))
 
                 await session.commit()
                 for user_esprit, esprit_data in summon_results:
                     transaction_logger.log_summon(interaction, banner, cost_str, esprit_data, user_esprit)
             
             # --- REFACTORED: Pass configs to the create method ---
-            combat_settings = self.bot.config.get("combat_settings", {})
             visuals_config = self.bot.config.get("visuals", {})
             
             pagination_view = await EspritSummonPaginationView.create(
@@ -244,7 +240,8 @@ class SummonCog(commands.Cog):
                 summons=summon_results,
                 author_id=interaction.user.id,
                 combat_settings=combat_settings,
-                visuals_config=visuals_config
+                visuals_config=visuals_config,
+                image_generator=self.image_generator
             )
             initial_embed, initial_image_bytes, _ = pagination_view.pages[0]
             initial_file = discord.File(io.BytesIO(initial_image_bytes), filename="card_0.png")
@@ -5,11 +5,10 @@ from discord.ext import commands
 from discord import app_commands
 from datetime import datetime
 from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
 import random
 
 from src.database.db import get_session
-from src.database.models import User, UserEsprit
+from src.database.models import User, UserEsprit, get_team_esprits
 from src.utils.logger import get_logger
 from src.utils.rate_limiter import RateLimiter
 
@@ -82,20 +81,12 @@ class UtilityCog(commands.Cog, name="Utility"):
                 embed.add_field(name="Core Currencies", value=currency_text, inline=False)
 
                 # Optimized team query
-                team_ids = [eid for eid in [user.active_esprit_id, user.support1_esprit_id, user.support2_esprit_id] if eid]
-                team_esprits = {}
-                if team_ids:
-                    result = await session.execute(
-                        select(UserEsprit).where(UserEsprit.id.in_(team_ids)).options(selectinload(UserEsprit.esprit_data))
-                    )
-                    team_esprits = {str(e.id): e for e in result.scalars().all()}
+                team_esprits = await get_team_esprits(session, user)
                 
                 team_list_str = []
-                team_roles = {"active_esprit_id": "👑 Leader", "support1_esprit_id": "⚔️ Support 1", "support2_esprit_id": "🛡️ Support 2"}
+                team_roles = ["👑 Leader", "⚔️ Support 1", "🛡️ Support 2"]
                 
-                for role_attr, role_name in team_roles.items():
-                    esprit_id = getattr(user, role_attr)
-                    esprit = team_esprits.get(esprit_id)
+                for role_name, esprit in zip(team_roles, team_esprits):
                     if esprit and esprit.esprit_data:
                         team_list_str.append(f"**{role_name}:** {esprit.esprit_data.name} `Lv.{esprit.current_level}`")
                     else:
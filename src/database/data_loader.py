@@ -26,8 +26,7 @@ class EspritDataLoader:
             log.error(f"Esprit data file not found: {self.json_path}")
             raise FileNotFoundError(f"Could not find {self.json_path}")
             
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            esprits_data = json.load(f)
+        esprits_data = json.loads(self.json_path.read_bytes())
             
         loaded_count = 0
         async with get_session() as session:
@@ -46,7 +45,7 @@ class EspritDataLoader:
                     for key, value in data.items():
                         if hasattr(existing, key):
                             setattr(existing, key, value)
-                    log.info(f"Updated Esprit: {esprit_id}")
+                    log.debug("Updated Esprit: %s", esprit_id)
                 else:
                     # Create new entry
                     esprit = EspritData(
@@ -68,7 +67,7 @@ class EspritDataLoader:
                         base_mana=data.get('base_mana', 0)
                     )
                     session.add(esprit)
-                    log.info(f"Added new Esprit: {esprit_id}")
+                    log.debug("Added new Esprit: %s", esprit_id)
                     
                 loaded_count += 1
                 
@@ -78,6 +77,7 @@ class EspritDataLoader:
                     log.info(f"Committed batch: {loaded_count} Esprits processed")
                     
             await session.commit()
+            await EspritData.reload_power_cache(session)
             
         log.info(f"Esprit data loading complete: {loaded_count} Esprits loaded/updated")
         return loaded_count
@@ -91,8 +91,7 @@ class EspritDataLoader:
         if not self.json_path.exists():
             return []
             
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            esprits_data = json.load(f)
+        esprits_data = json.loads(self.json_path.read_bytes())
             
         missing = []
         async with get_session() as session:
@@ -1,21 +1,212 @@
 # src/database/models.py
+from bisect import bisect_right
+from enum import IntEnum
+from operator import attrgetter
 from typing import Optional, List, Dict
 from datetime import datetime
 import sqlalchemy as sa
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Field, SQLModel, Relationship
 from nanoid import generate
 
+__all__ = [
+    "EspritData", "User", "UserEsprit",
+    "Rarity", "EspritClass", "NamedEnumType",
+    "generate_nanoid", "bulk_create_esprits", "top_esprits_for_user",
+    "increment_user_fields", "spend_user_fields", "get_owned_esprit", "get_team_esprits", "resync_cached_power",
+]
+
+# Rows per INSERT round trip when creating Esprits in bulk.
+BULK_INSERT_BATCH_SIZE = 500
+
 def generate_nanoid():
     """Generates a short, unique ID."""
     return generate(size=6)
 
+# User team slot columns, in slot order (leader, support 1, support 2).
+TEAM_SLOT_FIELDS = ("active_esprit_id", "support1_esprit_id", "support2_esprit_id")
+_get_team_ids = attrgetter(*TEAM_SLOT_FIELDS)
+
+# --- Config-Derived Lookup Tables ---
+# Tables are rebuilt only when the config object they were derived from is replaced (e.g. on reload).
+# Holding a reference to the source keeps its identity from being reused by a new object.
+_DERIVED_TABLES: Dict[str, tuple] = {}
+
+def _derived_table(name: str, source, build) -> tuple:
+    """Returns build(source), cached until `source` is a different object."""
+    cached = _DERIVED_TABLES.get(name)
+    if cached is not None and cached[0] is source: return cached[1]
+    table = build(source)
+    _DERIVED_TABLES[name] = (source, table)
+    return table
+
+def _build_player_cap_table(thresholds: list) -> tuple:
+    """Player level -> base Esprit cap; the last threshold the level has reached wins."""
+    top_level = max((th["player_level"] for th in thresholds), default=0)
+    table = []
+    for level in range(top_level + 1):
+        player_cap = 10
+        for th in thresholds:
+            if level >= th["player_level"]:
+                player_cap = th["base_esprit_cap"]
+        table.append(player_cap)
+    return tuple(table)
+
+def _build_level_caps(progression_cfg: dict) -> tuple:
+    """Resolves the Esprit level cap inputs once: (player level -> base cap table, rarity -> cap)."""
+    return (
+        _build_player_cap_table(progression_cfg.get("player_level_thresholds", [])),
+        progression_cfg.get("rarity_level_caps", {}),
+    )
+
+def _xp_for_level(level: int, xp_curve: dict) -> int:
+    """XP needed to go from `level` to the next player level."""
+    return int(xp_curve['base'] * (level ** xp_curve['exponent']))
+
+def _build_xp_table(progression_cfg: dict) -> tuple:
+    """Player level -> XP needed for the next level, for every level up to player_max_level."""
+    xp_curve = progression_cfg.get("player_xp_curve", {"base": 100, "exponent": 1.5})
+    top_level = progression_cfg.get("player_max_level", 80)
+    return tuple(_xp_for_level(level, xp_curve) for level in range(1, top_level + 1))
+
+def _build_xp_cumulative(progression_cfg: dict) -> tuple:
+    """Entry i is the total XP needed to go from level 1 to level i + 1 (stops at a non-positive step)."""
+    total, table = 0, [0]
+    for needed in _derived_table("player_xp", progression_cfg, _build_xp_table):
+        if needed <= 0: break
+        total += needed
+        table.append(total)
+    return tuple(table)
+
+def _limit_break_cost(rarity: str, level: int, breaks: int, lb_cfg: dict) -> tuple:
+    """(remna, virelite) for the next limit break, memoized per (rarity, level, breaks) until lb_cfg is replaced."""
+    costs = _derived_table("limit_break_costs", lb_cfg, lambda cfg: {})
+    key = (rarity, level, breaks)
+    cost = costs.get(key)
+    if cost is None:
+        base_costs = lb_cfg.get("base_costs", {})
+        rarity_mult = lb_cfg.get("rarity_cost_multipliers", {}).get(rarity, 1.0)
+        level_mult = 1 + (level / lb_cfg.get("level_scaling_factor", 50))
+        break_mult = lb_cfg.get("previous_breaks_multiplier", 1.5) ** breaks
+        total_multiplier = rarity_mult * level_mult * break_mult
+        cost = costs[key] = (
+            int(base_costs.get("remna", 200) * total_multiplier),
+            int(base_costs.get("virelite", 500) * total_multiplier),
+        )
+    return cost
+
+# --- Enumerated Columns ---
+class Rarity(IntEnum):
+    COMMON = 0
+    UNCOMMON = 1
+    RARE = 2
+    EPIC = 3
+    CELESTIAL = 4
+    SUPREME = 5
+    DEITY = 6
+
+class EspritClass(IntEnum):
+    UNKNOWN = 0
+    MYSTIC = 1
+    DESTROYER = 2
+    SUPPORT = 3
+    GUARDIAN = 4
+
+class NamedEnumType(sa.TypeDecorator):
+    """Stores an IntEnum as SMALLINT while exposing its display name (e.g. "Epic") to Python."""
+    impl = sa.SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: type[IntEnum]):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._by_name = {member.name.title(): member.value for member in enum_cls}
+        self._by_value = {value: name for name, value in self._by_name.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None: return None
+        if value not in self._by_name:
+            raise ValueError(f"Unknown {self.enum_cls.__name__} '{value}'")
+        return self._by_name[value]
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._by_value[value]
+
+# --- Sigil Power Formula ---
+# Base stat columns in the order _sigil_power consumes them.
+POWER_STAT_FIELDS = (
+    "base_hp", "base_attack", "base_defense", "base_speed", "base_magic_resist",
+    "base_crit_rate", "base_block_rate", "base_dodge_chance", "base_mana", "base_mana_regen",
+)
+_get_power_stats = attrgetter(*POWER_STAT_FIELDS)
+# Stat name ("hp", "crit_rate", ...) -> getter for its base column on EspritData.
+_STAT_GETTERS = {field.removeprefix("base_"): attrgetter(field) for field in POWER_STAT_FIELDS}
+
+# EspritData is static, so the power-relevant columns are cached column-wise
+# (one tuple per field) for roster-wide ranking. POWER_CACHE maps esprit_id -> row index.
+POWER_CACHE: Dict[str, int] = {}
+_POWER_COLUMNS: Dict[str, tuple] = {}
+
+def _level_multiplier(level: int, per_level: float) -> float:
+    """Stat growth factor for an Esprit at the given level."""
+    return 1 + (level - 1) * per_level
+
+def _scaled_stat(base_stat: float, level_mult: float, boost: float) -> int:
+    """Applies level growth and the limit break boost to a single base stat."""
+    if base_stat == 0: return 0
+    return max(1, int(base_stat * level_mult * boost))
+
+def _power_params(power_cfg: dict, stat_cfg: dict) -> tuple:
+    """Resolves every config value Sigil Power reads, so roster-wide callers look them up once."""
+    weights = power_cfg.get("sigil_weights", {})
+    return (
+        stat_cfg.get("level_multiplier_per_level", 0.05),
+        weights.get('hp', 0.25), weights.get('attack', 2.5), weights.get('defense', 2.5),
+        weights.get('speed', 3.0), weights.get('magic_resist', 2.0),
+        weights, power_cfg.get("rarity_multipliers", {}),
+    )
+
+def _flat_power(stats: tuple, weights: dict) -> float:
+    """Level-independent part of Sigil Power: the secondary stats, which are weighted raw."""
+    crit_rate, block_rate, dodge, mana, mana_regen = stats[5:]
+    return (
+        (crit_rate * weights.get('crit_rate', 500)) +
+        (block_rate * weights.get('block_rate', 500)) +
+        (dodge * weights.get('dodge', 600)) +
+        (mana * weights.get('mana', 0.5)) +
+        (mana_regen * weights.get('mana_regen', 100))
+    )
+
+def _sigil_power(stats: tuple, rarity: str, level: int, boost: float, params: tuple, flat: Optional[float] = None) -> int:
+    """Calculates Sigil Power from base stats ordered as POWER_STAT_FIELDS.
+
+    `params` comes from _power_params(); `flat` may be passed in when the caller already has _flat_power() for these stats.
+    """
+    per_level, w_hp, w_attack, w_defense, w_speed, w_magic_resist, weights, rarity_mults = params
+    hp, attack, defense, speed, magic_resist = stats[:5]
+    level_mult = _level_multiplier(level, per_level)
+    if flat is None: flat = _flat_power(stats, weights)
+    # _scaled_stat inlined: this runs once per Esprit when ranking whole rosters
+    power = (
+        ((max(1, int(hp * level_mult * boost)) if hp else 0) * w_hp) +
+        ((max(1, int(attack * level_mult * boost)) if attack else 0) * w_attack) +
+        ((max(1, int(defense * level_mult * boost)) if defense else 0) * w_defense) +
+        ((max(1, int(speed * level_mult * boost)) if speed else 0) * w_speed) +
+        ((max(1, int(magic_resist * level_mult * boost)) if magic_resist else 0) * w_magic_resist) +
+        flat
+    )
+    return max(1, int(power * rarity_mults.get(rarity, 1.0)))
+
 class EspritData(SQLModel, table=True):
     __tablename__ = "esprit_data"
-    esprit_id: str = Field(default_factory=generate_nanoid, primary_key=True, index=True)
+    # (rarity, class_name) serves rarity-only filters as well, so rarity has no index of its own.
+    __table_args__ = (sa.Index("ix_esprit_data_rarity_class", "rarity", "class_name"),)
+    esprit_id: str = Field(default_factory=generate_nanoid, primary_key=True)
     name: str = Field(index=True)
     description: str
-    rarity: str = Field(index=True)
-    class_name: str = Field(default="Unknown", index=True)
+    rarity: str = Field(sa_column=sa.Column(NamedEnumType(Rarity), nullable=False))
+    class_name: str = Field(default="Unknown", sa_column=sa.Column(NamedEnumType(EspritClass), nullable=False, index=True))
     visual_asset_path: str
     base_hp: int
     base_attack: int
@@ -32,9 +223,22 @@ class EspritData(SQLModel, table=True):
         sa_relationship_kwargs={"cascade": "all, delete-orphan"}
     )
 
+    @classmethod
+    async def reload_power_cache(cls, session) -> int:
+        """Reloads the column-wise base stat cache used for roster power ranking."""
+        fields = ("esprit_id", "rarity") + POWER_STAT_FIELDS
+        rows = (await session.execute(sa.select(*(getattr(cls, f) for f in fields)))).all()
+        columns = list(zip(*rows)) if rows else [()] * len(fields)
+
+        POWER_CACHE.clear()
+        POWER_CACHE.update({esprit_id: idx for idx, esprit_id in enumerate(columns[0])})
+        _POWER_COLUMNS.clear()
+        _POWER_COLUMNS.update(zip(fields, columns))
+        return len(rows)
+
 class User(SQLModel, table=True):
     __tablename__ = "users"
-    user_id: str = Field(primary_key=True, index=True)
+    user_id: str = Field(primary_key=True)
     username: str = Field(index=True)
     level: int = Field(default=1, index=True)
     level_cap: int = Field(default=10, nullable=False) # The player's current max level
@@ -62,36 +266,55 @@ class User(SQLModel, table=True):
         sa_relationship_kwargs={"cascade": "all, delete-orphan", "foreign_keys": "[UserEsprit.owner_id]"}
     )
 
+    # --- Team Methods ---
+    @property
+    def team_esprit_ids(self) -> tuple:
+        """Equipped Esprit IDs in slot order; empty slots are None."""
+        return _get_team_ids(self)
+
+    def set_team(self, esprit_ids: List[Optional[str]]) -> None:
+        """Replaces the whole team in slot order, clearing any slots not given."""
+        padded = list(esprit_ids)[:len(TEAM_SLOT_FIELDS)] + [None] * len(TEAM_SLOT_FIELDS)
+        for field, esprit_id in zip(TEAM_SLOT_FIELDS, padded):
+            setattr(self, field, esprit_id)
+
     # --- Player Progression Methods ---
     def get_xp_for_next_level(self, progression_cfg: dict) -> int:
         """Calculates the total XP required to reach the next player level."""
         if self.level >= self.level_cap:
             return 0
-        xp_curve = progression_cfg.get("player_xp_curve", {"base": 100, "exponent": 1.5})
-        return int(xp_curve['base'] * (self.level ** xp_curve['exponent']))
+        xp_table = _derived_table("player_xp", progression_cfg, _build_xp_table)
+        if 1 <= self.level <= len(xp_table): return xp_table[self.level - 1]
+        return _xp_for_level(self.level, progression_cfg.get("player_xp_curve", {"base": 100, "exponent": 1.5}))
 
     def add_xp(self, amount: int, progression_cfg: dict) -> tuple[bool, int]:
         """Adds XP, handles multiple level-ups, and returns (did_level_up, levels_gained)."""
         if self.level >= self.level_cap:
             return False, 0
 
-        leveled_up = False
-        levels_gained = 0
+        start_level = self.level
         self.xp += amount
-        
+
+        # Within the precomputed curve, find the new level with one bisect over cumulative XP
+        cumulative = _derived_table("player_xp_cumulative", progression_cfg, _build_xp_cumulative)
+        if 1 <= start_level < len(cumulative):
+            total = cumulative[start_level - 1] + self.xp
+            self.level = max(start_level, min(self.level_cap, len(cumulative), bisect_right(cumulative, total)))
+            self.xp = total - cumulative[self.level - 1]
+
+        # Past the end of the table (or a custom curve), step level by level
         xp_needed = self.get_xp_for_next_level(progression_cfg)
         while xp_needed > 0 and self.xp >= xp_needed and self.level < self.level_cap:
             self.level += 1
             self.xp -= xp_needed
-            leveled_up = True
-            levels_gained += 1
             xp_needed = self.get_xp_for_next_level(progression_cfg)
         
         # Clamp XP at max level for the current cap
         if self.level >= self.level_cap:
             self.xp = 0
 
-        return leveled_up, levels_gained
+        levels_gained = self.level - start_level
+        return levels_gained > 0, levels_gained
     
     def get_next_trial_info(self, progression_cfg: dict) -> Optional[Dict]:
         """Finds the next available trial for the user based on their level."""
@@ -102,13 +325,20 @@ class User(SQLModel, table=True):
 
 class UserEsprit(SQLModel, table=True):
     __tablename__ = "user_esprits"
+    # Roster queries filter by owner and sort by level or power; the composites also cover owner-only lookups.
+    __table_args__ = (
+        sa.Index("ix_user_esprits_owner_level", "owner_id", "current_level"),
+        sa.Index("ix_user_esprits_owner_power", "owner_id", "cached_power"),
+    )
     id: str = Field(default_factory=generate_nanoid, primary_key=True)
-    owner_id: str = Field(foreign_key="users.user_id", index=True)
+    owner_id: str = Field(foreign_key="users.user_id")
     esprit_data_id: str = Field(foreign_key="esprit_data.esprit_id", index=True)
     current_hp: int
     current_level: int = Field(default=1, index=True)
     limit_breaks_performed: int = Field(default=0)
     stat_boost_multiplier: float = Field(default=1.0)
+    # Denormalized Sigil Power; kept current by refresh_cached_power() and resync_cached_power().
+    cached_power: int = Field(default=0, nullable=False)
     locked: bool = Field(default=False, nullable=False)
     acquired_at: datetime = Field(
         default=None,
@@ -121,29 +351,27 @@ class UserEsprit(SQLModel, table=True):
     esprit_data: Optional[EspritData] = Relationship(back_populates="owners")
 
     # --- Esprit Progression & Calculation Methods ---
+    def _level_caps(self, progression_cfg: dict) -> tuple:
+        """(current cap, rarity cap) for this Esprit; both rarity lookups in can_limit_break share it."""
+        cap_table, rarity_caps = _derived_table("level_caps", progression_cfg, _build_level_caps)
+        player_cap = cap_table[max(0, min(self.owner.level, len(cap_table) - 1))]
+        rarity_cap = rarity_caps.get(self.esprit_data.rarity, 100)
+        return min(player_cap, rarity_cap), rarity_cap
+
     def get_level_cap(self, progression_cfg: dict) -> int:
         """Calculates this Esprit's current maximum level based on its owner's level and its rarity."""
         if not self.owner or not self.esprit_data: return 10
-        
-        thresholds = progression_cfg.get("player_level_thresholds", [])
-        player_cap = 10
-        for th in thresholds:
-            if self.owner.level >= th["player_level"]:
-                player_cap = th["base_esprit_cap"]
-        
-        rarity_cap = progression_cfg.get("rarity_level_caps", {}).get(self.esprit_data.rarity, 100)
-        return min(player_cap, rarity_cap)
+        return self._level_caps(progression_cfg)[0]
 
     def can_limit_break(self, progression_cfg: dict) -> dict:
         """Checks if this Esprit is eligible for a limit break."""
         if not self.owner or not self.esprit_data:
             return {"can_break": False, "reason": "Missing owner or Esprit data"}
 
-        current_cap = self.get_level_cap(progression_cfg)
+        current_cap, rarity_cap = self._level_caps(progression_cfg)
         if self.current_level < current_cap:
             return {"can_break": False, "reason": "Not at level cap"}
             
-        rarity_cap = progression_cfg.get("rarity_level_caps", {}).get(self.esprit_data.rarity, 100)
         if current_cap >= rarity_cap:
              return {"can_break": False, "reason": "At absolute rarity maximum"}
         
@@ -151,51 +379,171 @@ class UserEsprit(SQLModel, table=True):
 
     def get_limit_break_cost(self, lb_cfg: dict) -> dict:
         """Calculates the cost for the next limit break."""
-        if not self.esprit_data: return {"remna": 999999, "virelite": 999999}
-        
-        base_costs = lb_cfg.get("base_costs", {})
-        rarity_mult = lb_cfg.get("rarity_cost_multipliers", {}).get(self.esprit_data.rarity, 1.0)
-        level_mult = 1 + (self.current_level / lb_cfg.get("level_scaling_factor", 50))
-        break_mult = lb_cfg.get("previous_breaks_multiplier", 1.5) ** self.limit_breaks_performed
-        
-        total_multiplier = rarity_mult * level_mult * break_mult
-        
-        return {
-            "remna": int(base_costs.get("remna", 200) * total_multiplier),
-            "virelite": int(base_costs.get("virelite", 500) * total_multiplier),
-        }
+        data = self.esprit_data
+        if not data: return {"remna": 999999, "virelite": 999999}
+
+        remna, virelite = _limit_break_cost(data.rarity, self.current_level, self.limit_breaks_performed, lb_cfg)
+        return {"remna": remna, "virelite": virelite}
 
     def calculate_stat(self, stat_name: str, stat_cfg: dict) -> int:
-        """Calculates a single stat based on level, limit breaks, and configs."""
-        if not self.esprit_data: return 0
+        """Calculates a single stat based on level, limit breaks, and configs, memoized until its inputs change."""
+        data = self.esprit_data
+        if not data: return 0
         
-        base_stat = getattr(self.esprit_data, f"base_{stat_name.lower()}", 0)
-        if base_stat == 0: return 0
+        getter = _STAT_GETTERS.get(stat_name) or _STAT_GETTERS.get(stat_name.lower())
+        if not getter: return 0
 
-        level_multiplier = 1 + (self.current_level - 1) * stat_cfg.get("level_multiplier_per_level", 0.05)
-        
-        final_value = base_stat * level_multiplier * self.stat_boost_multiplier
-        return max(1, int(final_value))
+        # Same invalidation scheme as calculate_power: a level-up, limit break, base stat edit or config reload changes the key.
+        key = (self.current_level, self.stat_boost_multiplier, _get_power_stats(data), stat_cfg)
+        memo = self.__dict__.get("_stat_memo")
+        if memo is None or memo[0] != key:
+            memo = self.__dict__["_stat_memo"] = (key, {})
+        stats = memo[1]
+        if getter not in stats:
+            level_mult = _level_multiplier(key[0], stat_cfg.get("level_multiplier_per_level", 0.05))
+            stats[getter] = _scaled_stat(getter(data), level_mult, key[1])
+        return stats[getter]
 
     def calculate_power(self, power_cfg: dict, stat_cfg: dict) -> int:
-        """Calculates the total Sigil Power of the Esprit."""
-        if not self.esprit_data: return 0
-        
-        weights = power_cfg.get("sigil_weights", {})
-        power = (
-            (self.calculate_stat('hp', stat_cfg) * weights.get('hp', 0.25)) +
-            (self.calculate_stat('attack', stat_cfg) * weights.get('attack', 2.5)) +
-            (self.calculate_stat('defense', stat_cfg) * weights.get('defense', 2.5)) +
-            (self.calculate_stat('speed', stat_cfg) * weights.get('speed', 3.0)) +
-            (self.calculate_stat('magic_resist', stat_cfg) * weights.get('magic_resist', 2.0)) +
-            (self.esprit_data.base_crit_rate * weights.get('crit_rate', 500)) +
-            (self.esprit_data.base_block_rate * weights.get('block_rate', 500)) +
-            (self.esprit_data.base_dodge_chance * weights.get('dodge', 600)) +
-            (self.esprit_data.base_mana * weights.get('mana', 0.5)) +
-            (self.esprit_data.base_mana_regen * weights.get('mana_regen', 100))
-        )
-        
-        rarity_mult = power_cfg.get("rarity_multipliers", {}).get(self.esprit_data.rarity, 1.0)
-        return max(1, int(power * rarity_mult))
+        """Calculates the total Sigil Power of the Esprit, memoized until its inputs change."""
+        data = self.esprit_data
+        if not data: return 0
+        # Keyed on everything the formula reads, base stat values included, so level-ups, limit breaks,
+        # an in-place Esprit data reload and config reloads all recompute.
+        key = (self.current_level, self.stat_boost_multiplier, _get_power_stats(data), data.rarity, power_cfg, stat_cfg)
+        memo = self.__dict__.get("_power_memo")
+        if memo is None or memo[0] != key:
+            power = _sigil_power(key[2], key[3], key[0], key[1], _power_params(power_cfg, stat_cfg))
+            memo = self.__dict__["_power_memo"] = (key, power)
+        return memo[1]
+
+    def refresh_cached_power(self, power_cfg: dict, stat_cfg: dict) -> int:
+        """Stores the current Sigil Power in cached_power; call after changing level or stat boost."""
+        self.cached_power = self.calculate_power(power_cfg, stat_cfg)
+        return self.cached_power
+
+# --- Atomic Balance Updates ---
+# Both run a single SQL-side UPDATE (col = col + n), so concurrent commands can't overwrite
+# each other's balance changes. User objects already in the session are kept in sync.
+async def increment_user_fields(session, user_id: str, **deltas: int) -> None:
+    """Adds to counter columns on a User (currencies, pity counts)."""
+    values = {getattr(User, field): getattr(User, field) + amount for field, amount in deltas.items() if amount}
+    if not values: return
+    await session.execute(sa.update(User).where(User.user_id == user_id).values(values))
+
+async def spend_user_fields(session, user_id: str, **costs: int) -> bool:
+    """Deducts from counter columns on a User. Returns False, changing nothing, if any balance is short."""
+    costs = {field: amount for field, amount in costs.items() if amount}
+    if not costs: return True
+    stmt = (
+        sa.update(User)
+        .where(User.user_id == user_id, *(getattr(User, field) >= amount for field, amount in costs.items()))
+        .values({getattr(User, field): getattr(User, field) - amount for field, amount in costs.items()})
+    )
+    return (await session.execute(stmt)).rowcount == 1
+
+async def get_owned_esprit(session, owner: User, esprit_id: str, for_update: bool = False) -> Optional[UserEsprit]:
+    """Fetches one of `owner`'s Esprits with esprit_data eager-loaded, or None if missing or not theirs.
+
+    `owner` is attached from the caller's already-loaded User instead of being selected again.
+    """
+    user_esprit = await session.get(
+        UserEsprit, esprit_id, with_for_update=for_update,
+        options=[selectinload(UserEsprit.esprit_data)]
+    )
+    if not user_esprit or user_esprit.owner_id != owner.user_id: return None
+    set_committed_value(user_esprit, "owner", owner)
+    return user_esprit
+
+async def get_team_esprits(session, user: User) -> List[Optional[UserEsprit]]:
+    """Loads the user's equipped Esprits in slot order with one query; empty or missing slots are None."""
+    team_ids = user.team_esprit_ids
+    equipped = [esprit_id for esprit_id in team_ids if esprit_id]
+    if not equipped: return [None] * len(team_ids)
+    result = await session.execute(
+        sa.select(UserEsprit).where(UserEsprit.id.in_(equipped))
+        .options(selectinload(UserEsprit.esprit_data))
+    )
+    by_id = {e.id: e for e in result.scalars()}
+    return [by_id.get(esprit_id) for esprit_id in team_ids]
+
+async def bulk_create_esprits(session, owner_id: str, esprit_datas: List[EspritData], power_cfg: dict, stat_cfg: dict, level: int = 1) -> List[UserEsprit]:
+    """Creates one UserEsprit per EspritData using batched INSERTs instead of a flush per row.
+
+    Returned instances are persistent in `session` with `esprit_data` already populated.
+    """
+    params = _power_params(power_cfg, stat_cfg)
+    rows = [
+        {
+            "id": generate_nanoid(), "owner_id": owner_id, "esprit_data_id": ed.esprit_id, "current_hp": ed.base_hp, "current_level": level,
+            "cached_power": _sigil_power(_get_power_stats(ed), ed.rarity, level, 1.0, params),
+        }
+        for ed in esprit_datas
+    ]
+    created: List[UserEsprit] = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        stmt = sa.insert(UserEsprit).returning(UserEsprit, sort_by_parameter_order=True)
+        result = await session.scalars(stmt, rows[start:start + BULK_INSERT_BATCH_SIZE])
+        created.extend(result.all())
+
+    for user_esprit, esprit_data in zip(created, esprit_datas):
+        set_committed_value(user_esprit, "esprit_data", esprit_data)
+    return created
+
+async def _powers_for_rows(session, rows: list, power_cfg: dict, stat_cfg: dict) -> List[tuple]:
+    """Computes (power, esprit_id) for (id, esprit_data_id, level, boost) rows against the cached base stat columns."""
+    if any(row[1] not in POWER_CACHE for row in rows):
+        await EspritData.reload_power_cache(session)
+
+    stat_columns = [_POWER_COLUMNS[f] for f in POWER_STAT_FIELDS]
+    rarities = _POWER_COLUMNS["rarity"]
+    params = _power_params(power_cfg, stat_cfg)
+    weights = params[6]
+    # Rosters hold many copies of the same Esprit, often at the same level and boost (fresh summons):
+    # stats are built once per species and power once per distinct (species, level, boost).
+    by_idx: Dict[int, tuple] = {}
+    by_state: Dict[tuple, int] = {}
+    powers = []
+    for esprit_id, data_id, level, boost in rows:
+        idx = POWER_CACHE.get(data_id)
+        if idx is None: continue
+        state = (idx, level, boost)
+        power = by_state.get(state)
+        if power is None:
+            if idx not in by_idx:
+                stats = tuple(column[idx] for column in stat_columns)
+                by_idx[idx] = (stats, _flat_power(stats, weights))
+            stats, flat = by_idx[idx]
+            power = by_state[state] = _sigil_power(stats, rarities[idx], level, boost, params, flat)
+        powers.append((power, esprit_id))
+    return powers
+
+async def top_esprits_for_user(session, user_id: str, k: int = 3) -> List[UserEsprit]:
+    """Returns the user's k strongest Esprits, strongest first.
+
+    Ranks on the stored cached_power, walking ix_user_esprits_owner_power so only k rows are read.
+    """
+    result = await session.execute(
+        sa.select(UserEsprit).where(UserEsprit.owner_id == user_id)
+        .order_by(UserEsprit.cached_power.desc()).limit(k)
+        .options(selectinload(UserEsprit.esprit_data))
+    )
+    return list(result.scalars())
 
+async def resync_cached_power(session, power_cfg: dict, stat_cfg: dict) -> int:
+    """Recomputes UserEsprit.cached_power for every row, writing back only the ones that changed.
 
+    The stored value bakes in the power config, so this runs at startup and after a config reload.
+    """
+    rows = (await session.execute(
+        sa.select(UserEsprit.id, UserEsprit.esprit_data_id, UserEsprit.current_level, UserEsprit.stat_boost_multiplier, UserEsprit.cached_power)
+    )).all()
+    stored = {row.id: row.cached_power for row in rows}
+    changed = [
+        {"id": esprit_id, "cached_power": power}
+        for power, esprit_id in await _powers_for_rows(session, [row[:4] for row in rows], power_cfg, stat_cfg)
+        if stored[esprit_id] != power
+    ]
+    for start in range(0, len(changed), BULK_INSERT_BATCH_SIZE):
+        await session.execute(sa.update(UserEsprit), changed[start:start + BULK_INSERT_BATCH_SIZE])
+    return len(changed)
@@ -1,10 +1,14 @@
 # src/utils/background_tasks.py
 import asyncio
-from asyncio.log import logger
 from datetime import datetime
 import discord
 from discord.ext import tasks, commands
 
+from src.utils.logger import get_logger
+from src.utils.rate_limiter import RateLimiter
+
+logger = get_logger(__name__)
+
 class BackgroundTasks(commands.Cog):
     """Background tasks for maintenance and optimization"""
     
@@ -28,14 +32,18 @@ class BackgroundTasks(commands.Cog):
     @tasks.loop(minutes=5)
     async def rate_limit_cleanup(self):
         """Clean up old rate limit entries"""
-        for cog in self.bot.cogs.values():
-            if hasattr(cog, 'esprit_group') and hasattr(cog.esprit_group, 'rate_limiter'):
-                cleaned = await cog.esprit_group.rate_limiter.cleanup()
-                if cleaned > 0:
-                    logger.info(f"Cleaned {cleaned} rate limit entries from {cog.__class__.__name__}")
+        cleaned = 0
+        for limiter in list(RateLimiter.instances):
+            cleaned += await limiter.cleanup()
+        if cleaned > 0:
+            logger.info(f"Cleaned {cleaned} rate limit entries")
     
     @cache_cleanup.before_loop
     @rate_limit_cleanup.before_loop
     async def before_background_tasks(self):
         """Wait for bot to be ready before starting tasks"""
-        await self.bot.wait_until_ready()
\ No newline at end of file
+        await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(BackgroundTasks(bot))
+    logger.info("✅ BackgroundTasks loaded")
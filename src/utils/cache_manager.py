@@ -1,8 +1,10 @@
 # src/utils/cache_manager.py
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Set, Tuple
+from collections import defaultdict
 import asyncio
+import heapq
 import json
+import time
 
 class CacheManager:
     """
@@ -10,8 +12,12 @@ class CacheManager:
     Reduces database load for frequently accessed data
     """
     def __init__(self, default_ttl: int = 300):
-        self.cache: Dict[str, Any] = {}
-        self.timestamps: Dict[str, datetime] = {}
+        # key -> (value, time stored); times are time.monotonic() so wall-clock changes can't expire entries
+        self.cache: Dict[str, Tuple[Any, float]] = {}
+        # Min-heap of (default expiry, key, time stored); cleanup() only pops entries that are due
+        self._expiry: List[Tuple[float, str, float]] = []
+        # "user:" / "user:123:" -> keys under that prefix, so clear_pattern doesn't scan the whole cache
+        self._prefix_index: Dict[str, Set[str]] = defaultdict(set)
         self.default_ttl = default_ttl
         self.lock = asyncio.Lock()
         self.stats = {
@@ -20,48 +26,79 @@ class CacheManager:
             "evictions": 0
         }
     
+    @staticmethod
+    def _prefixes(key: str):
+        """Every ':'-terminated prefix of key ('user:123:team' -> 'user:', 'user:123:')."""
+        end = key.find(":")
+        while end != -1:
+            yield key[:end + 1]
+            end = key.find(":", end + 1)
+
+    def _remove(self, key: str) -> None:
+        """Drops key from the cache and the prefix index. Caller holds the lock (or doesn't await)."""
+        del self.cache[key]
+        for prefix in self._prefixes(key):
+            keys = self._prefix_index.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys: del self._prefix_index[prefix]
+
+    def _compact_expiry(self) -> None:
+        """Rebuilds the expiry heap with one entry per live key. Caller holds the lock."""
+        self._expiry = [(stored_at + self.default_ttl, key, stored_at) for key, (_, stored_at) in self.cache.items()]
+        heapq.heapify(self._expiry)
+
     async def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
         """Get value from cache with TTL check"""
-        async with self.lock:
-            if key in self.cache:
-                # Check if expired
-                ttl_seconds = ttl or self.default_ttl
-                if datetime.now() - self.timestamps[key] > timedelta(seconds=ttl_seconds):
-                    # Expired, remove it
-                    del self.cache[key]
-                    del self.timestamps[key]
-                    self.stats["evictions"] += 1
-                    self.stats["misses"] += 1
-                    return None
-                
-                self.stats["hits"] += 1
-                return self.cache[key]
+        # No lock: nothing below awaits, so no other coroutine can run between the read and the eviction.
+        entry = self.cache.get(key)
+        if entry is not None:
+            # Check if expired
+            ttl_seconds = ttl or self.default_ttl
+            if time.monotonic() - entry[1] > ttl_seconds:
+                # Expired, remove it
+                self._remove(key)
+                self.stats["evictions"] += 1
+                self.stats["misses"] += 1
+                return None
             
-            self.stats["misses"] += 1
-            return None
+            self.stats["hits"] += 1
+            return entry[0]
+        
+        self.stats["misses"] += 1
+        return None
     
     async def set(self, key: str, value: Any) -> None:
         """Set value in cache"""
         async with self.lock:
-            self.cache[key] = value
-            self.timestamps[key] = datetime.now()
+            now = time.monotonic()
+            if key not in self.cache:
+                for prefix in self._prefixes(key):
+                    self._prefix_index[prefix].add(key)
+            self.cache[key] = (value, now)
+            heapq.heappush(self._expiry, (now + self.default_ttl, key, now))
+            # Overwrites and deletes leave stale heap entries behind; once they outnumber the live keys,
+            # rebuild from the cache so a frequently rewritten key can't grow the heap until its TTL comes round.
+            if len(self._expiry) > 2 * len(self.cache) + 64:
+                self._compact_expiry()
     
     async def delete(self, key: str) -> bool:
         """Delete specific key from cache"""
         async with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-                del self.timestamps[key]
-                return True
-            return False
+            if key not in self.cache: return False
+            self._remove(key)
+            return True
     
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching a pattern (e.g., 'user:123:*')"""
+        prefix = pattern.rstrip("*")
         async with self.lock:
-            keys_to_delete = [k for k in self.cache.keys() if k.startswith(pattern)]
+            if prefix.endswith(":"):
+                keys_to_delete = list(self._prefix_index.get(prefix, ()))
+            else:
+                keys_to_delete = [k for k in self.cache.keys() if k.startswith(prefix)]
             for key in keys_to_delete:
-                del self.cache[key]
-                del self.timestamps[key]
+                self._remove(key)
             return len(keys_to_delete)
     
     async def get_stats(self) -> Dict[str, int]:
@@ -78,16 +115,17 @@ class CacheManager:
     async def cleanup(self) -> int:
         """Remove all expired entries"""
         async with self.lock:
-            now = datetime.now()
-            expired_keys = []
-            
-            for key, timestamp in self.timestamps.items():
-                if now - timestamp > timedelta(seconds=self.default_ttl):
-                    expired_keys.append(key)
+            now = time.monotonic()
+            expiry = self._expiry
+            removed = 0
             
-            for key in expired_keys:
-                del self.cache[key]
-                del self.timestamps[key]
-                self.stats["evictions"] += 1
+            while expiry and expiry[0][0] < now:
+                _, key, stored_at = heapq.heappop(expiry)
+                # Skip heap entries for keys that were since deleted or overwritten
+                entry = self.cache.get(key)
+                if entry is not None and entry[1] == stored_at:
+                    self._remove(key)
+                    self.stats["evictions"] += 1
+                    removed += 1
             
-            return len(expired_keys)
\ No newline at end of file
+            return removed
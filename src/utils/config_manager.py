@@ -19,13 +19,25 @@ def load_all_configs(base_path: str = 'data/config') -> dict:
 
     for path in config_dir.glob("*.json"):
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                # Use the filename (e.g., "economy_settings") as the key
-                all_configs[path.stem] = json.load(f)
+            # Use the filename (e.g., "economy_settings") as the key; json.loads decodes the UTF-8 bytes itself
+            all_configs[path.stem] = json.loads(path.read_bytes())
         except json.JSONDecodeError:
             logger.error(f"Failed to decode JSON from '{path}'")
         except Exception as e:
             logger.error(f"Failed to load config file '{path}': {e}")
             
     logger.info(f"Successfully loaded {len(all_configs)} configuration files.")
-    return all_configs
\ No newline at end of file
+    return all_configs
+
+
+class ConfigManager:
+    """Holds the loaded configs; load_all() re-reads every file and swaps the new dict in."""
+    def __init__(self, base_path: str = 'data/config'):
+        self.base_path = base_path
+        self.configs: dict = {}
+        self.load_all()
+
+    def load_all(self) -> dict:
+        """(Re)loads every config file. A fresh dict replaces the old one, so derived caches keyed on it rebuild."""
+        self.configs = load_all_configs(self.base_path)
+        return self.configs
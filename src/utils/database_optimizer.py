@@ -6,43 +6,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 class DatabaseOptimizer:
-    """Database optimization utilities for scaling"""
-    
-    @staticmethod
-    async def create_indexes(session: AsyncSession):
-        """Create database indexes for better performance"""
-        indexes = [
-            # User lookups
-            "CREATE INDEX IF NOT EXISTS idx_user_id ON users(id)",
-            "CREATE INDEX IF NOT EXISTS idx_user_level ON users(level)",
-            
-            # Esprit lookups
-            "CREATE INDEX IF NOT EXISTS idx_user_esprit_owner ON user_esprits(owner_id)",
-            "CREATE INDEX IF NOT EXISTS idx_user_esprit_id ON user_esprits(id)",
-            "CREATE INDEX IF NOT EXISTS idx_user_esprit_data ON user_esprits(esprit_data_id)",
-            
-            # Composite indexes for common queries
-            "CREATE INDEX IF NOT EXISTS idx_user_esprit_owner_data ON user_esprits(owner_id, esprit_data_id)",
-            "CREATE INDEX IF NOT EXISTS idx_user_team ON users(active_esprit_id, support1_esprit_id, support2_esprit_id)",
-        ]
-        
-        for index in indexes:
-            try:
-                await session.execute(text(index))
-                logger.info(f"Created index: {index.split('idx_')[1].split(' ')[0]}")
-            except Exception as e:
-                logger.warning(f"Index creation failed (may already exist): {e}")
-        
-        await session.commit()
+    """Database maintenance utilities. Schema changes, indexes included, belong in Alembic revisions."""
     
+    # Tables the bot queries; refreshed together by analyze_tables()
+    TABLES = ("users", "user_esprits", "esprit_data")
+
     @staticmethod
     async def analyze_tables(session: AsyncSession):
-        """Run ANALYZE on tables for query optimization"""
-        tables = ["users", "user_esprits", "esprit_data"]
-        
-        for table in tables:
-            try:
-                await session.execute(text(f"ANALYZE {table}"))
-                logger.info(f"Analyzed table: {table}")
-            except Exception as e:
-                logger.error(f"Failed to analyze {table}: {e}")
\ No newline at end of file
+        """Refresh planner statistics; run once after a migration (/admin analyze), not on every boot."""
+        # Postgres takes a table list in one statement; SQLite's bare ANALYZE covers every table
+        if session.bind.dialect.name == "postgresql":
+            statement = f"ANALYZE {', '.join(DatabaseOptimizer.TABLES)}"
+        else:
+            statement = "ANALYZE"
+        try:
+            await session.execute(text(statement))
+            await session.commit()
+            logger.info(f"Analyzed tables: {', '.join(DatabaseOptimizer.TABLES)}")
+        except Exception as e:
+            logger.error(f"Failed to analyze tables: {e}")
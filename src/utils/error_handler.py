@@ -2,11 +2,26 @@
 import asyncio
 import discord
 from discord.ext import commands
-import traceback
 import logging
 
 logger = logging.getLogger(__name__)
 
+# User-friendly error messages, keyed by exception type
+ERROR_MESSAGES = {
+    commands.CommandOnCooldown: "⏳ This command is on cooldown. Try again in {error.retry_after:.1f} seconds.",
+    commands.MissingPermissions: "🚫 You don't have permission to use this command.",
+    commands.BotMissingPermissions: "🤖 I don't have the necessary permissions to do this.",
+    asyncio.TimeoutError: "⏱️ The operation timed out. Please try again.",
+}
+
+def _error_message(error: Exception):
+    """Template for error: exact type first, then the isinstance walk for subclasses."""
+    message = ERROR_MESSAGES.get(type(error))
+    if message is not None: return message
+    for error_type, message in ERROR_MESSAGES.items():
+        if isinstance(error, error_type): return message
+    return None
+
 class ErrorHandler:
     """Centralized error handling for better user experience"""
     
@@ -14,23 +29,14 @@ class ErrorHandler:
     async def handle_interaction_error(interaction: discord.Interaction, error: Exception):
         """Handle errors in interactions gracefully"""
         
-        # User-friendly error messages
-        error_messages = {
-            commands.CommandOnCooldown: "⏳ This command is on cooldown. Try again in {error.retry_after:.1f} seconds.",
-            commands.MissingPermissions: "🚫 You don't have permission to use this command.",
-            commands.BotMissingPermissions: "🤖 I don't have the necessary permissions to do this.",
-            asyncio.TimeoutError: "⏱️ The operation timed out. Please try again.",
-        }
-        
         # Check for known error types
-        for error_type, message in error_messages.items():
-            if isinstance(error, error_type):
-                embed = discord.Embed(
-                    title="❌ Error",
-                    description=message.format(error=error),
-                    color=discord.Color.red()
-                )
-                break
+        message = _error_message(error)
+        if message is not None:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=message.format(error=error),
+                color=discord.Color.red()
+            )
         else:
             # Generic error message
             embed = discord.Embed(
@@ -39,9 +45,9 @@ class ErrorHandler:
                 color=discord.Color.red()
             )
             
-            # Log the full error
-            logger.error(f"Unhandled error in {interaction.command.name if interaction.command else 'interaction'}: {error}")
-            logger.error(traceback.format_exc())
+            # Log the full error; exc_info takes the traceback from the exception itself and is only formatted if emitted
+            command_name = getattr(interaction.command, 'name', 'interaction')
+            logger.error(f"Unhandled error in {command_name}: {error}", exc_info=error)
         
         # Send error message
         try:
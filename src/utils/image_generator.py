@@ -5,10 +5,10 @@ import asyncio
 import io
 import os
 import json # ADDED
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Tuple
 
-import discord
 from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageOps
 
 # REMOVED: from src.utils.config_manager import ConfigManager
@@ -20,19 +20,38 @@ logger = get_logger(__name__)
 CARD_W, CARD_H = 450, 630
 SPRITE_H = 550
 RARITY_ICON_SIZE = (48, 48)
+# zlib level for card PNGs: level 1 encodes in well under half the time of the default 6 for a few KB more upload
+PNG_COMPRESS_LEVEL = 1
+
+# A card depends only on static Esprit data and the rarity visuals, so encoded PNGs are kept
+# (most recently used last) and served again instead of re-rendering. Only touched from the event loop.
+CARD_CACHE_SIZE = 256
+_card_cache: OrderedDict[tuple, bytes] = OrderedDict()
+
+@lru_cache(maxsize=256)
+def _load_sprite(sprite_path: str) -> Image.Image:
+    """Decodes a sprite and scales it to SPRITE_H once per path; callers only read (paste) from it."""
+    sprite_img = Image.open(sprite_path).convert("RGBA")
+    scale = SPRITE_H / sprite_img.height
+    return sprite_img.resize((int(sprite_img.width * scale), SPRITE_H), Image.Resampling.NEAREST)
+
+@lru_cache(maxsize=8)
+def _load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """One FreeType face per (path, size), shared by every ImageGenerator."""
+    return ImageFont.truetype(font_path, size=size)
 
 class ImageGenerator:
     """
     Thread-safe, async-friendly sprite / card generator.
-    All heavy Pillow work is delegated to `asyncio.to_thread`
-    so the Discord event-loop never blocks.
+    `render_esprit_card_png` is the public entry point; all heavy Pillow work
+    is delegated to `asyncio.to_thread` so the Discord event-loop never blocks.
     """
     def __init__(self, assets_base: str = "assets") -> None:
         self.assets_base = assets_base
 
         font_path = os.path.join(assets_base, "ui", "fonts", "PressStart2P.ttf")
         try:
-            self.font_header = ImageFont.truetype(font_path, size=40)
+            self.font_header = _load_font(font_path, 40)
         except OSError:
             logger.warning("PressStart2P.ttf not found – falling back to default font")
             self.font_header = ImageFont.load_default()
@@ -49,6 +68,7 @@ class ImageGenerator:
 
     # ... (the rest of the file remains unchanged) ...
     @staticmethod
+    @lru_cache(maxsize=64)
     def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
         return tuple(int(hex_color.lstrip("#")[i : i + 2], 16) for i in (0, 2, 4))
 
@@ -61,8 +81,9 @@ class ImageGenerator:
             logger.warning(f"Rarity icon not found: {full_path}")
             return None
 
-    def _create_rarity_aura(self, size: tuple[int, int], color: Tuple[int, int, int]) -> Image.Image:
-        # This implementation remains correct.
+    @staticmethod
+    def _create_rarity_aura(size: tuple[int, int], color: Tuple[int, int, int]) -> Image.Image:
+        # Only called through the cached _card_base, so the 70px blur runs once per colour.
         aura = Image.new("RGBA", size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(aura)
         cx, cy = size[0] / 2, size[1] / 2
@@ -72,39 +93,50 @@ class ImageGenerator:
             draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=color + (alpha,))
         return aura.filter(ImageFilter.GaussianBlur(radius=70))
 
+    @classmethod
+    @lru_cache(maxsize=16)
+    def _card_base(cls, color: Tuple[int, int, int]) -> Image.Image:
+        """Background with the rarity aura already applied; renders start from a copy of this."""
+        card = Image.new("RGB", (CARD_W, CARD_H), (20, 20, 20))
+        aura = cls._create_rarity_aura((CARD_W, CARD_H), color)
+        card.paste(aura, (0, 0), aura)
+        return card
+
     def _draw_text_outline(self, img_draw: ImageDraw.ImageDraw, pos: Tuple[int, int], text: str, font: ImageFont.FreeTypeFont, fill="white", anchor="lt"):
-        # This implementation remains correct.
-        x, y = pos
-        for ox, oy in ((-2, -2), (2, -2), (-2, 2), (2, 2)):
-            img_draw.text((x + ox, y + oy), text, font=font, fill="black", anchor=anchor)
-        img_draw.text(pos, text, font=font, fill=fill, anchor=anchor)
-
-    async def render_esprit_card(self, esprit_data: dict) -> Image.Image:
-        """Create a full esprit card image without blocking the event-loop."""
-        return await asyncio.to_thread(self._render_sync, esprit_data)
-
-    async def to_discord_file(self, img: Image.Image, filename: str = "esprit_card.png") -> discord.File | None:
-        """Return a ready-to-send `discord.File`, saving in a worker thread."""
-        try:
-            return await asyncio.to_thread(self._save_sync, img, filename)
-        except Exception as exc:
-            logger.error(f"to_discord_file failed for {filename}: {exc}", exc_info=True)
-            return None
+        # Pillow strokes the glyphs natively, so the outline is one shaping pass instead of five.
+        img_draw.text(pos, text, font=font, fill=fill, anchor=anchor, stroke_width=2, stroke_fill="black")
+
+    def _card_key(self, esprit_data: dict) -> tuple:
+        """Everything _render_sync reads, so equal keys always render identical cards."""
+        rarity = esprit_data.get("rarity", "Unknown")
+        visual = self.rarities_data.get(rarity, {}).get("visuals", {})
+        return (
+            self.assets_base, esprit_data.get("name", "Unknown"), rarity, esprit_data.get("visual_asset_path", ""),
+            visual.get("color"), visual.get("border_color"), visual.get("icon_asset"),
+        )
+
+    async def render_esprit_card_png(self, esprit_data: dict) -> bytes:
+        """PNG bytes of the esprit card, rendered in a worker thread on first request and cached after."""
+        key = self._card_key(esprit_data)
+        png = _card_cache.get(key)
+        if png is not None:
+            _card_cache.move_to_end(key)
+            return png
+        png = await asyncio.to_thread(self._render_png_sync, esprit_data)
+        _card_cache[key] = png
+        if len(_card_cache) > CARD_CACHE_SIZE:
+            _card_cache.popitem(last=False)
+        return png
 
     def _render_sync(self, esprit_data: dict) -> Image.Image:
-        # This implementation remains correct.
-        card = Image.new("RGBA", (CARD_W, CARD_H), (20, 20, 20, 255))
-        draw = ImageDraw.Draw(card)
         rarity = esprit_data.get("rarity", "Unknown")
         visual = self.rarities_data.get(rarity, {}).get("visuals", {})
         glow_rgb = self._hex_to_rgb(visual.get("color", "#808080"))
-        aura = self._create_rarity_aura((CARD_W, CARD_H), glow_rgb)
-        card = Image.alpha_composite(card, aura)
+        # The card is opaque, so the background and aura are flattened once per colour into an RGB base.
+        card = self._card_base(glow_rgb).copy()
         draw = ImageDraw.Draw(card)
         sprite_path = os.path.join(self.assets_base, esprit_data.get("visual_asset_path", ""))
-        sprite_img = Image.open(sprite_path).convert("RGBA")
-        scale = SPRITE_H / sprite_img.height
-        sprite_img = sprite_img.resize((int(sprite_img.width * scale), SPRITE_H), Image.Resampling.NEAREST)
+        sprite_img = _load_sprite(sprite_path)
         sprite_x, sprite_y = (CARD_W - sprite_img.width) // 2, (CARD_H - sprite_img.height) // 2 + 30
         card.paste(sprite_img, (sprite_x, sprite_y), sprite_img)
         self._draw_text_outline(draw, (CARD_W // 2, 30), esprit_data.get("name", "Unknown"), self.font_header, anchor="mt")
@@ -116,9 +148,7 @@ class ImageGenerator:
         draw.rectangle([0, 0, CARD_W - 1, CARD_H - 1], outline=border_rgb, width=5)
         return card
 
-    def _save_sync(self, img: Image.Image, filename: str) -> discord.File:
-        # This implementation remains correct.
+    def _render_png_sync(self, esprit_data: dict) -> bytes:
         buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        buf.seek(0)
-        return discord.File(buf, filename=filename)
+        self._render_sync(esprit_data).save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+        return buf.getvalue()
@@ -1,16 +1,22 @@
 #src.utils.rate_limiter.py
 #add import aioredis when needed for scale
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
 import asyncio
+import time
+import weakref
 
 class RateLimiter:
+    # Every live limiter, for periodic cleanup; weak so limiters of reloaded cogs drop out on their own.
+    instances: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
     def __init__(self, calls: int = 5, period: int = 60, redis=None):
         self.calls = calls
         self.period = period
         self.redis = redis  # aioredis.Redis or None for in-memory fallback
-        self.users: Dict[str, List[datetime]] = {}
+        # user_id -> time.monotonic() of each call still inside the window
+        self.users: Dict[str, List[float]] = {}
         self.lock = asyncio.Lock()
+        RateLimiter.instances.add(self)
     
     async def check(self, user_id: str) -> bool:
         if self.redis:
@@ -21,11 +27,11 @@ class RateLimiter:
             return count <= self.calls
         # fallback to memory
         async with self.lock:
-            now = datetime.now()
+            now = time.monotonic()
             if user_id not in self.users:
                 self.users[user_id] = [now]
                 return True
-            cutoff = now - timedelta(seconds=self.period)
+            cutoff = now - self.period
             self.users[user_id] = [t for t in self.users[user_id] if t > cutoff]
             if len(self.users[user_id]) < self.calls:
                 self.users[user_id].append(now)
@@ -41,8 +47,7 @@ class RateLimiter:
             if user_id not in self.users or not self.users[user_id]:
                 return 0
             oldest_call = min(self.users[user_id])
-            cooldown_end = oldest_call + timedelta(seconds=self.period)
-            remaining = (cooldown_end - datetime.now()).total_seconds()
+            remaining = oldest_call + self.period - time.monotonic()
             return max(0, int(remaining))
     
     async def reset(self, user_id: str) -> None:
@@ -58,7 +63,7 @@ class RateLimiter:
         if self.redis:
             return 0  # not needed
         async with self.lock:
-            cutoff = datetime.now() - timedelta(seconds=self.period)
+            cutoff = time.monotonic() - self.period
             cleaned = 0
             for user_id in list(self.users.keys()):
                 self.users[user_id] = [t for t in self.users[user_id] if t > cutoff]
@@ -8,6 +8,14 @@ from src.database.models import UserEsprit
 MAX_PAGE_SIZE = 10
 TIMEOUT = 300
 
+# Using full rarity names for clarity
+RARITY_EMOJIS = {
+    "Common": "⚪", "Uncommon": "🟢", "Rare": "🔵", "Epic": "🟣",
+    "Celestial": "🟡", "Supreme": "🔴", "Deity": "🌟"
+}
+# Rarity sort position, highest first; unknown rarities sort last
+RARITY_ORDER = {rarity: i for i, rarity in enumerate(["Deity", "Supreme", "Celestial", "Epic", "Rare", "Uncommon", "Common"])}
+
 class SortMethod(str, Enum):
     RARITY = "rarity"
     POWER = "power"
@@ -31,11 +39,7 @@ class EnhancedCollectionView(discord.ui.View):
         self._setup_components()
 
     def _get_rarity_emoji(self, rarity: str) -> str:
-        # Using full rarity names for clarity
-        return {
-            "Common": "⚪", "Uncommon": "🟢", "Rare": "🔵", "Epic": "🟣",
-            "Celestial": "🟡", "Supreme": "🔴", "Deity": "🌟"
-        }.get(rarity, "❓")
+        return RARITY_EMOJIS.get(rarity, "❓")
 
     def _setup_components(self):
         # --- BUTTONS ---
@@ -88,24 +92,17 @@ class EnhancedCollectionView(discord.ui.View):
         # Apply filtering
         self.filtered_esprits = [e for e in self.all_esprits if not self.rarity_filter or e.esprit_data.rarity == self.rarity_filter]
         
-        # Get configs with readable variable names
-        combat_cfg = self.bot.config.get("combat_settings", {})
-        power_cfg = combat_cfg.get("power_calculation", {})
-        stat_cfg = combat_cfg.get("stat_calculation", {})
-        
-        # A robust, readable rarity sorting map
-        rarity_order = {rarity: i for i, rarity in enumerate(["Deity", "Supreme", "Celestial", "Epic", "Rare", "Uncommon", "Common"])}
-
-        # Apply sorting
-        self.filtered_esprits.sort(
-            key=lambda e: (
-                e.esprit_data.name if self.sort_by == SortMethod.NAME else
-                e.current_level if self.sort_by == SortMethod.LEVEL else
-                e.calculate_power(power_cfg, stat_cfg) if self.sort_by == SortMethod.POWER else
-                rarity_order.get(e.esprit_data.rarity, 99) # Default to last for unknown rarities
-            ),
-            reverse=(self.sort_by in [SortMethod.LEVEL, SortMethod.POWER])
-        )
+        # Apply sorting; the key function is chosen once rather than re-checking sort_by per Esprit
+        if self.sort_by == SortMethod.NAME:
+            key = lambda e: e.esprit_data.name
+        elif self.sort_by == SortMethod.LEVEL:
+            key = lambda e: e.current_level
+        elif self.sort_by == SortMethod.POWER:
+            # Stored power is kept current for the loaded config, so sorting needs no recomputation
+            key = lambda e: e.cached_power
+        else:
+            key = lambda e: RARITY_ORDER.get(e.esprit_data.rarity, 99)
+        self.filtered_esprits.sort(key=key, reverse=(self.sort_by in [SortMethod.LEVEL, SortMethod.POWER]))
         self.page = 0
 
     def _get_page_embed(self) -> discord.Embed:
@@ -128,11 +125,9 @@ class EnhancedCollectionView(discord.ui.View):
         
         # Get configs with readable variable names
         prog_cfg = self.bot.config.get("progression_settings", {}).get("progression", {})
-        power_cfg = self.bot.config.get("combat_settings", {}).get("power_calculation", {})
-        stat_cfg = self.bot.config.get("combat_settings", {}).get("stat_calculation", {})
 
         for ue in page_esprits:
-            power = ue.calculate_power(power_cfg, stat_cfg)
+            power = ue.cached_power
             embed.add_field(
                 name=f"{self._get_rarity_emoji(ue.esprit_data.rarity)} {ue.esprit_data.name}",
                 value=f"ID `{ue.id}` | Lvl **{ue.current_level}/{ue.get_level_cap(prog_cfg)}** | Sigil **{power:,}**",
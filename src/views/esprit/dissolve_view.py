@@ -2,6 +2,7 @@
 from typing import List, Set
 import discord
 from src.database.models import UserEsprit
+from src.views.esprit.collection_view import RARITY_EMOJIS
 from src.views.shared.confirmation_view import ConfirmationView
 
 MAX_DISSOLVE_PAGE_SIZE = 25
@@ -17,7 +18,7 @@ class BulkDissolveView(discord.ui.View):
         self._setup_components()
 
     def _get_rarity_emoji(self, rarity: str) -> str:
-        return {"Common":"⚪","Uncommon":"🟢","Rare":"🔵","Epic":"🟣","Celestial":"🟡","Supreme":"🔴","Deity":"🌟"}.get(rarity,"❓")
+        return RARITY_EMOJIS.get(rarity,"❓")
 
     def _setup_components(self):
         self.select_menu = discord.ui.Select(placeholder="Select Esprits...", min_values=0, max_values=MAX_DISSOLVE_PAGE_SIZE, row=0)
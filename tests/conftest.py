@@ -0,0 +1,56 @@
+# tests/conftest.py
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from src.database.models import EspritData, User, UserEsprit
+from src.utils.config_manager import load_all_configs
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "data" / "config"
+
+# Every relationship the model helpers read is declared here; anything else raises instead of lazy-loading,
+# so a helper that starts touching a new relationship fails the suite rather than adding a query per Esprit.
+EAGER_ROSTER = (
+    selectinload(User.owned_esprits).options(
+        selectinload(UserEsprit.esprit_data).raiseload("*"),
+        selectinload(UserEsprit.owner).raiseload("*"),
+        raiseload("*"),
+    ),
+    raiseload("*"),
+)
+
+@pytest.fixture(scope="session")
+def configs() -> dict:
+    return load_all_configs(str(CONFIG_DIR))
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+@pytest.fixture
+def seeded_user(session) -> str:
+    """A user owning one Esprit of each species in esprits.json, at mixed levels and limit breaks."""
+    esprits = json.loads((CONFIG_DIR / "esprits.json").read_bytes())
+    session.add(User(user_id="1", username="tester", level=25, level_cap=30))
+    for i, (esprit_id, data) in enumerate(esprits.items()):
+        session.add(EspritData(esprit_id=esprit_id, **data))
+        session.add(UserEsprit(
+            id=f"ue{i:04d}", owner_id="1", esprit_data_id=esprit_id, current_hp=data["base_hp"],
+            current_level=1 + (i * 7) % 60, limit_breaks_performed=i % 3, stat_boost_multiplier=1.1 ** (i % 3),
+        ))
+    session.commit()
+    session.expunge_all()
+    return "1"
+
+@pytest.fixture
+def eager_user(session, seeded_user) -> User:
+    """The seeded user with its roster loaded through EAGER_ROSTER only."""
+    return session.exec(select(User).where(User.user_id == seeded_user).options(*EAGER_ROSTER)).one()
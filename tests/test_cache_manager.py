@@ -0,0 +1,16 @@
+# tests/test_cache_manager.py
+import asyncio
+
+from src.utils.cache_manager import CacheManager
+
+def test_rewriting_a_key_keeps_the_expiry_heap_bounded():
+    async def run():
+        cache = CacheManager(default_ttl=300)
+        for i in range(10_000):
+            await cache.set("user:1:profile", i)
+        assert await cache.get("user:1:profile") == 9_999
+        return len(cache._expiry), len(cache.cache)
+
+    heap_size, live = asyncio.run(run())
+    assert live == 1
+    assert heap_size <= 2 * live + 64
@@ -0,0 +1,22 @@
+# tests/test_lazy_loads.py
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+def test_roster_helpers_need_no_lazy_loads(eager_user, configs):
+    combat = configs["combat_settings"]
+    power_cfg, stat_cfg = combat["power_calculation"], combat["stat_calculation"]
+    lb_cfg = combat["limit_break_system"]
+    prog_cfg = configs["progression_settings"]["progression"]
+
+    assert eager_user.owned_esprits
+    for esprit in eager_user.owned_esprits:
+        assert esprit.calculate_power(power_cfg, stat_cfg) > 0
+        assert esprit.calculate_stat("hp", stat_cfg) > 0
+        assert esprit.get_level_cap(prog_cfg) > 0
+        esprit.can_limit_break(prog_cfg)
+        esprit.get_limit_break_cost(lb_cfg)
+
+def test_undeclared_relationship_raises(eager_user):
+    species = eager_user.owned_esprits[0].esprit_data
+    with pytest.raises(InvalidRequestError):
+        species.owners
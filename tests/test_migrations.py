@@ -0,0 +1,33 @@
+# tests/test_migrations.py
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlmodel import SQLModel
+
+from src.database.models import EspritData, User, UserEsprit
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
+def test_models_define_each_table_once():
+    assert len({id(model) for model in (EspritData, User, UserEsprit)}) == 3
+    assert set(SQLModel.metadata.tables) == {"esprit_data", "users", "user_esprits"}
+
+def test_migrations_match_models(tmp_path):
+    db_path = tmp_path / "faye.db"
+    # No ini file, so env.py leaves the test run's logging configuration alone.
+    cfg = Config()
+    cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+    cfg.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{db_path}")
+    command.upgrade(cfg, "head")
+
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    try:
+        with engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn), SQLModel.metadata)
+    finally:
+        engine.dispose()
+    assert diff == [], f"models.py and the migrations disagree; add a migration for: {diff}"
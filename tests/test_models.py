@@ -0,0 +1,13 @@
+# tests/test_models.py
+
+def test_power_memo_follows_in_place_data_reload(eager_user, configs):
+    combat = configs["combat_settings"]
+    power_cfg, stat_cfg = combat["power_calculation"], combat["stat_calculation"]
+    esprit = eager_user.owned_esprits[0]
+    power, attack = esprit.calculate_power(power_cfg, stat_cfg), esprit.calculate_stat("attack", stat_cfg)
+
+    # EspritDataLoader(force_reload=True) edits base stats on the existing EspritData object
+    esprit.esprit_data.base_attack *= 3
+
+    assert esprit.calculate_stat("attack", stat_cfg) > attack
+    assert esprit.calculate_power(power_cfg, stat_cfg) > power